@@ -7,14 +7,46 @@ import os
 import sys
 import json
 import yaml
+import hashlib
 import logging
+
+try:
+    import orjson
+except ImportError:  # optional fast JSON encoder
+    orjson = None
 from pathlib import Path
 from typing import Dict, List, Set, Union, Optional, Any, Tuple
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Use the libyaml C loader/dumper when available; fall back to the
+# pure-Python implementations otherwise.
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+# Files larger than this are passed through a json round-trip after YAML
+# parsing: json's C encoder/decoder rebuilds the tree faster than PyYAML's
+# node construction, and it normalizes integer keys (e.g. response codes)
+# to the strings OpenAPI expects. Below the threshold the constant
+# overhead of the round-trip isn't worth it.
+_JSON_ROUNDTRIP_THRESHOLD = 256 * 1024
+
+# 1 MB output buffer: the emitter makes many small writes, and the default
+# 8 KB buffer turns each grouped spec into hundreds of syscalls.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Effectively-unlimited line width for YAML output: the emitter skips its
+# per-scalar line-wrap bookkeeping when nothing ever wraps.
+_YAML_WIDTH = 2 ** 31 - 1
+
+# HTTP methods that carry operations in a path item; everything else
+# (summary, description, parameters, servers, x-* extensions) is skipped.
+_OP_METHODS = frozenset(('get', 'put', 'post', 'delete', 'options', 'head',
+                         'patch', 'trace'))
+
 
 class OpenAPISplitterError(Exception):
     """Custom exception for OpenAPI Splitter errors."""
@@ -27,58 +59,131 @@ class ComponentResolver:
     def __init__(self, spec: Dict[str, Any]):
         self.spec = spec
         self.components = spec.get('components', {})
+        # Cache of ref -> outgoing refs, so each component definition is
+        # walked at most once even across many groups.
+        self._outgoing_refs: Dict[str, frozenset] = {}
+        # Ids of spec subtrees known to contain no '$ref'; built lazily on
+        # the first scan and used to prune whole subtrees from later scans.
+        self._ref_free: Optional[Set[int]] = None
+
+    def _index_ref_free(self) -> Set[int]:
+        """
+        Index every subtree of the spec that contains no '$ref'.
+
+        Returns:
+            Set of id()s of ref-free dict/list nodes. The spec itself keeps
+            the nodes alive, so the ids stay valid for this resolver's
+            lifetime.
+        """
+        ref_free: Set[int] = set()
+        # Post-order walk: a container is ref-free iff it has no '$ref'
+        # key and all of its container children are ref-free.
+        stack = [(self.spec, False)]
+        while stack:
+            node, processed = stack.pop()
+            node_type = type(node)
+            if node_type is dict:
+                children = node.values()
+            elif node_type is list:
+                children = node
+            else:
+                continue
+            if not processed:
+                stack.append((node, True))
+                for child in children:
+                    if type(child) in (dict, list):
+                        stack.append((child, False))
+            else:
+                if node_type is dict and '$ref' in node:
+                    continue
+                if all(id(child) in ref_free for child in children
+                       if type(child) in (dict, list)):
+                    ref_free.add(id(node))
+        return ref_free
     
     def find_component_references(self, obj: Any, used_components: Set[str]) -> None:
         """
-        Recursively find all component references in an object.
-        
+        Find all component references in an object.
+
+        Walks the tree iteratively with an explicit stack, avoiding Python
+        call overhead per node and RecursionError on deeply nested schemas.
+
         Args:
             obj: The object to search for references
             used_components: Set to store found component references
         """
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                if key == '$ref' and isinstance(value, str):
-                    if value.startswith('#/components/'):
-                        ref_parts = value.split('/')
-                        if len(ref_parts) >= 4:
-                            component_type = ref_parts[2]
-                            component_name = '/'.join(ref_parts[3:])
-                            used_components.add(f"{component_type}/{component_name}")
-                else:
-                    self.find_component_references(value, used_components)
-        elif isinstance(obj, list):
-            for item in obj:
-                self.find_component_references(item, used_components)
+        if self._ref_free is None:
+            self._ref_free = self._index_ref_free()
+        ref_free = self._ref_free
+
+        stack = [obj]
+        while stack:
+            current = stack.pop()
+            if type(current) is dict:
+                for key, value in current.items():
+                    if key == '$ref' and type(value) is str:
+                        if value.startswith('#/components/'):
+                            ref_parts = value.split('/', 3)
+                            if len(ref_parts) >= 4:
+                                # Intern: the same ref occurs many times, so
+                                # sets compare interned keys by identity.
+                                used_components.add(
+                                    sys.intern(ref_parts[2] + '/' + ref_parts[3]))
+                    elif id(value) not in ref_free:
+                        stack.append(value)
+            elif type(current) is list:
+                stack.extend(item for item in current if id(item) not in ref_free)
     
+    def outgoing_references(self, ref: str) -> frozenset:
+        """
+        Get the direct component references of a component definition.
+
+        Results are memoized per ref, so shared components are only
+        walked once regardless of how many groups reach them.
+
+        Args:
+            ref: Component reference as 'type/name'
+
+        Returns:
+            Frozen set of refs used directly by that component
+        """
+        cached = self._outgoing_refs.get(ref)
+        if cached is not None:
+            return cached
+
+        refs: Set[str] = set()
+        parts = ref.split('/', 1)
+        if len(parts) == 2:
+            component_type, component_name = parts
+            if component_type in self.components:
+                component_def = self.components[component_type].get(component_name)
+                if component_def:
+                    self.find_component_references(component_def, refs)
+
+        result = frozenset(refs)
+        self._outgoing_refs[ref] = result
+        return result
+
     def resolve_transitive_references(self, initial_refs: Set[str]) -> Set[str]:
         """
         Resolve all transitive component references.
-        
+
         Args:
             initial_refs: Initial set of component references
-            
+
         Returns:
             Complete set including all transitive dependencies
         """
         all_refs = set(initial_refs)
-        to_process = list(initial_refs)
-        
+        to_process = deque(initial_refs)
+
         while to_process:
-            ref = to_process.pop(0)
-            parts = ref.split('/', 1)
-            if len(parts) == 2:
-                component_type, component_name = parts
-                if component_type in self.components:
-                    component_def = self.components[component_type].get(component_name)
-                    if component_def:
-                        new_refs = set()
-                        self.find_component_references(component_def, new_refs)
-                        for new_ref in new_refs:
-                            if new_ref not in all_refs:
-                                all_refs.add(new_ref)
-                                to_process.append(new_ref)
-        
+            ref = to_process.popleft()
+            for new_ref in self.outgoing_references(ref):
+                if new_ref not in all_refs:
+                    all_refs.add(new_ref)
+                    to_process.append(new_ref)
+
         return all_refs
     
     def filter_components(self, used_refs: Set[str]) -> Dict[str, Any]:
@@ -91,20 +196,20 @@ class ComponentResolver:
         Returns:
             Filtered components dictionary
         """
-        filtered = {}
-        
+        buckets = defaultdict(list)
         for ref in used_refs:
-            parts = ref.split('/', 1)
-            if len(parts) == 2:
-                component_type, component_name = parts
-                if component_type in self.components:
-                    if component_type not in filtered:
-                        filtered[component_type] = {}
-                    if component_name in self.components[component_type]:
-                        filtered[component_type][component_name] = \
-                            self.components[component_type][component_name]
-        
-        return filtered
+            component_type, sep, component_name = ref.partition('/')
+            if sep:
+                buckets[component_type].append(component_name)
+
+        return {
+            component_type: {
+                name: self.components[component_type][name]
+                for name in names if name in self.components[component_type]
+            }
+            for component_type, names in buckets.items()
+            if component_type in self.components
+        }
 
 
 class OpenAPISplitter:
@@ -137,6 +242,12 @@ class OpenAPISplitter:
         self.output_format = output_format.lower()
         self.spec = None
         self.base_spec = {}
+        self._paths = {}
+        self._tag_index = {}
+        self._resolver = None
+        self._path_component_closure = None
+        self._global_extra_closure = frozenset()
+        self._has_refs = True
         
         if not self.input_file.exists():
             raise OpenAPISplitterError(f"Input file not found: {self.input_file}")
@@ -155,29 +266,61 @@ class OpenAPISplitter:
             OpenAPISplitterError: If loading fails
         """
         try:
+            loaded_from_yaml = False
             with open(self.input_file, 'r', encoding='utf-8') as f:
                 if self.input_file.suffix.lower() in ['.yaml', '.yml']:
-                    self.spec = yaml.safe_load(f)
+                    self.spec = yaml.load(f, Loader=_YamlLoader)
+                    loaded_from_yaml = True
                 elif self.input_file.suffix.lower() == '.json':
                     self.spec = json.load(f)
                 else:
                     # Try YAML first, then JSON
                     content = f.read()
                     try:
-                        self.spec = yaml.safe_load(content)
+                        self.spec = yaml.load(content, Loader=_YamlLoader)
+                        loaded_from_yaml = True
                     except yaml.YAMLError:
                         try:
                             self.spec = json.loads(content)
                         except json.JSONDecodeError:
                             raise OpenAPISplitterError("Unable to parse file as YAML or JSON")
-            
+
+            # Normalize large YAML-loaded trees through json (see
+            # _JSON_ROUNDTRIP_THRESHOLD above).
+            if (loaded_from_yaml and self.spec is not None
+                    and self.input_file.stat().st_size > _JSON_ROUNDTRIP_THRESHOLD):
+                try:
+                    self.spec = json.loads(json.dumps(self.spec))
+                except TypeError:
+                    # YAML scalars like unquoted dates have no JSON
+                    # equivalent; keep the parsed tree as-is.
+                    pass
+
+            self._install_spec(self.spec)
+
             logger.info(f"Loaded OpenAPI spec from {self.input_file}")
             return self.spec
-            
+
         except Exception as e:
             if isinstance(e, OpenAPISplitterError):
                 raise
             raise OpenAPISplitterError(f"Error loading spec: {e}") from e
+
+    def _install_spec(self, spec: Optional[Dict[str, Any]]) -> None:
+        """
+        Install a parsed spec and reset the per-spec derived state.
+
+        This is the post-parse wiring shared by load_spec and by tests
+        that seed an already-parsed spec.
+
+        Args:
+            spec: Parsed specification, or None
+        """
+        self.spec = spec
+        self._paths = spec.get('paths', {}) if spec else {}
+        self._resolver = None
+        self._path_component_closure = None
+        self._has_refs = True
     
     def create_base_spec(self) -> Dict[str, Any]:
         """
@@ -201,8 +344,57 @@ class OpenAPISplitter:
         # Add optional fields if present
         if 'externalDocs' in self.spec:
             self.base_spec['externalDocs'] = self.spec['externalDocs']
-        
+
+        # Index tag objects by name so per-group lookup is O(1)
+        self._tag_index = {
+            tag.get('name'): tag
+            for tag in self.base_spec.get('tags', [])
+            if isinstance(tag, dict) and 'name' in tag
+        }
+
+        # Component closures depend on the loaded spec; recompute on demand
+        self._path_component_closure = None
+
         return self.base_spec
+
+    def _get_resolver(self) -> ComponentResolver:
+        """
+        Get the resolver shared across all groups of the loaded spec.
+
+        Returns:
+            ComponentResolver built over the original spec
+        """
+        if self._resolver is None:
+            self._resolver = ComponentResolver(self.spec)
+        return self._resolver
+
+    def _build_component_closures(self) -> None:
+        """
+        Precompute transitive component closures once per loaded spec.
+
+        Builds a map of path -> frozenset of transitively reachable
+        components, plus one closure for the global sections shared by
+        every group. Per-group resolution then reduces to a set union
+        instead of re-walking the spec tree for each group.
+        """
+        resolver = self._get_resolver()
+
+        path_closure = {}
+        for path, path_item in self._paths.items():
+            direct_refs = set()
+            resolver.find_component_references(path_item, direct_refs)
+            path_closure[path] = frozenset(
+                resolver.resolve_transitive_references(direct_refs))
+
+        extra_refs = set()
+        for section in ['security', 'tags', 'servers', 'info']:
+            if section in self.base_spec:
+                resolver.find_component_references(self.base_spec[section], extra_refs)
+
+        self._path_component_closure = path_closure
+        self._global_extra_closure = frozenset(
+            resolver.resolve_transitive_references(extra_refs))
+        self._has_refs = bool(self._global_extra_closure) or any(path_closure.values())
     
     def group_by_tags(self) -> Dict[str, List[str]]:
         """
@@ -214,15 +406,14 @@ class OpenAPISplitter:
         groups = defaultdict(list)
         untagged_paths = []
         
-        paths = self.spec.get('paths', {})
+        paths = self._paths
         
         for path, methods in paths.items():
             path_tags = set()
             
-            for method, operation in methods.items():
-                if method.startswith('x-') or method in ['summary', 'description', 'parameters']:
-                    continue
-                
+            # dict.keys() & frozenset runs in C and yields only operations
+            for method in methods.keys() & _OP_METHODS:
+                operation = methods[method]
                 if isinstance(operation, dict):
                     operation_tags = operation.get('tags', [])
                     if operation_tags:
@@ -251,10 +442,11 @@ class OpenAPISplitter:
         """
         groups = defaultdict(list)
         
-        paths = self.spec.get('paths', {})
+        paths = self._paths
         
         for path in paths.keys():
-            path_parts = [p for p in path.split('/') if p]
+            # Filtering also drops interior empty segments (e.g. '/a//b')
+            path_parts = [part for part in path.split('/') if part]
             
             if len(path_parts) >= levels:
                 prefix = '/'.join(path_parts[:levels])
@@ -278,56 +470,65 @@ class OpenAPISplitter:
         Returns:
             Grouped specification dictionary
         """
-        grouped_spec = self.base_spec.copy()
-        grouped_spec['paths'] = {}
-        
-        original_paths = self.spec.get('paths', {})
-        
-        # Add paths to grouped spec
-        for path in paths:
-            if path in original_paths:
-                grouped_spec['paths'][path] = original_paths[path]
-        
+        original_paths = self._paths
+
+        # Collect paths for the grouped spec
+        group_paths = {p: original_paths[p] for p in paths if p in original_paths}
+
         # Handle tags for grouped spec
         if group_name != 'untagged':
-            relevant_tags = []
-            for tag in self.base_spec.get('tags', []):
-                if isinstance(tag, dict) and tag.get('name') == group_name:
-                    relevant_tags.append(tag)
-            grouped_spec['tags'] = relevant_tags
-        
-        # Filter components
-        resolver = ComponentResolver(grouped_spec)
-        used_components = set()
-        resolver.find_component_references(grouped_spec['paths'], used_components)
-        
-        # Add other spec sections that might reference components
-        for section in ['security', 'tags', 'servers', 'info']:
-            if section in grouped_spec:
-                resolver.find_component_references(grouped_spec[section], used_components)
-        
-        # Resolve transitive references
-        all_components = resolver.resolve_transitive_references(used_components)
-        
-        # Filter components
-        filtered_components = resolver.filter_components(all_components)
-        grouped_spec['components'] = filtered_components
-        
+            group_tag = self._tag_index.get(group_name)
+            relevant_tags = [group_tag] if group_tag is not None else []
+        else:
+            relevant_tags = self.base_spec.get('tags', [])
+
+        # Fast path: specs without components need no resolution at all
+        if not self.spec.get('components'):
+            filtered_components = {}
+        else:
+            # Union the precomputed per-path closures with the global ones
+            if self._path_component_closure is None:
+                self._build_component_closures()
+
+            if self._has_refs:
+                all_components = set(self._global_extra_closure)
+                for path in paths:
+                    closure = self._path_component_closure.get(path)
+                    if closure:
+                        all_components |= closure
+
+                filtered_components = self._get_resolver().filter_components(
+                    all_components)
+            else:
+                # Components exist but nothing references them
+                filtered_components = {}
+
+        # Build the grouped spec directly; the shared sections reference
+        # the base spec's objects rather than copying them per group.
+        grouped_spec = {
+            'openapi': self.base_spec.get('openapi', '3.0.0'),
+            'info': self.base_spec.get('info', {}),
+            'servers': self.base_spec.get('servers', []),
+            'components': filtered_components,
+            'security': self.base_spec.get('security', []),
+            'tags': relevant_tags,
+            'paths': group_paths,
+        }
+        if 'externalDocs' in self.base_spec:
+            grouped_spec['externalDocs'] = self.base_spec['externalDocs']
+
         return grouped_spec
     
-    def write_spec(self, spec: Dict[str, Any], filename: str) -> Path:
+    def _output_path(self, filename: str) -> Path:
         """
-        Write specification to file.
-        
+        Resolve the output path for a filename, normalizing the extension.
+
         Args:
-            spec: Specification to write
-            filename: Output filename
-            
+            filename: Output filename, with or without extension
+
         Returns:
-            Path to written file
+            Full path under the output directory
         """
-        os.makedirs(self.output_dir, exist_ok=True)
-        
         if self.output_format == "json":
             filename = filename.replace('.yaml', '.json').replace('.yml', '.json')
             if not filename.endswith('.json'):
@@ -335,16 +536,50 @@ class OpenAPISplitter:
         else:
             if not filename.endswith(('.yaml', '.yml')):
                 filename += '.yaml'
+
+        return self.output_dir / filename
+
+    def write_spec(self, spec: Dict[str, Any], filename: str) -> Path:
+        """
+        Write specification to file.
         
-        filepath = self.output_dir / filename
-        
+        Args:
+            spec: Specification to write
+            filename: Output filename
+            
+        Returns:
+            Path to written file
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        filepath = self._output_path(filename)
+
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                if self.output_format == "json":
-                    json.dump(spec, f, indent=2, ensure_ascii=False)
+            if self.output_format == "json":
+                if orjson is not None:
+                    # orjson serializes straight to UTF-8 bytes;
+                    # OPT_NON_STR_KEYS covers integer response-code keys.
+                    with open(filepath, 'wb') as f:
+                        f.write(orjson.dumps(
+                            spec, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
                 else:
-                    yaml.dump(spec, f, default_flow_style=False, sort_keys=False,
-                             allow_unicode=True, indent=2, width=1000)
+                    with open(filepath, 'w', encoding='utf-8',
+                              buffering=_WRITE_BUFFER_SIZE) as f:
+                        json.dump(spec, f, indent=2, ensure_ascii=False)
+            else:
+                with open(filepath, 'w', encoding='utf-8',
+                          buffering=_WRITE_BUFFER_SIZE) as f:
+                    if not spec:
+                        # The per-section loop below emits nothing for an
+                        # empty mapping; write it out explicitly.
+                        f.write('{}\n')
+                    # Emit one top-level section at a time so the peak
+                    # serialization buffer covers a single section rather
+                    # than the whole grouped spec.
+                    for key, value in spec.items():
+                        yaml.dump({key: value}, f, Dumper=_YamlDumper,
+                                 default_flow_style=False, sort_keys=False,
+                                 allow_unicode=True, indent=2, width=_YAML_WIDTH)
             
             logger.info(f"Created: {filepath}")
             return filepath
@@ -352,6 +587,81 @@ class OpenAPISplitter:
         except Exception as e:
             raise OpenAPISplitterError(f"Error writing {filepath}: {e}") from e
     
+    def _write_groups(self, groups: Dict[str, List[str]]) -> List[Path]:
+        """
+        Create grouped specs and write them to disk.
+
+        Specs are built serially so they share the resolver caches, then
+        written concurrently: the libyaml emitter releases the GIL and
+        file writes block on I/O, so threads overlap well here.
+
+        Args:
+            groups: Dictionary mapping group names to lists of paths
+
+        Returns:
+            List of created file paths, in group order
+        """
+        specs = []
+        for group_name, paths in groups.items():
+            spec = self.create_grouped_spec(group_name, paths)
+            safe_name = group_name.lower().replace(' ', '_').replace('/', '_')
+            specs.append((spec, safe_name))
+
+        # Distinct group names can sanitize to the same filename; keep only
+        # the last spec per target path (matching the deterministic
+        # last-write-wins of sequential writes) so concurrent writers never
+        # race on one file.
+        path_winners = {filename: index
+                        for index, (spec, filename) in enumerate(specs)}
+
+        # Deduplicate identical grouped specs by content hash: serialize
+        # and write each unique spec once, hardlink the duplicates.
+        unique_writes = []
+        link_jobs = []
+        seen_hashes = {}
+        for index, (spec, filename) in enumerate(specs):
+            if path_winners[filename] != index:
+                continue
+            digest = hashlib.blake2b(
+                json.dumps(spec, ensure_ascii=False, default=str).encode('utf-8')
+            ).digest()
+            if digest in seen_hashes:
+                link_jobs.append((index, seen_hashes[digest], filename))
+            else:
+                seen_hashes[digest] = index
+                unique_writes.append((index, spec, filename))
+
+        results: List[Optional[Path]] = [None] * len(specs)
+
+        if len(unique_writes) <= 1:
+            for index, spec, filename in unique_writes:
+                results[index] = self.write_spec(spec, filename)
+        else:
+            with ThreadPoolExecutor(max_workers=min(8, len(unique_writes))) as executor:
+                futures = [(index, executor.submit(self.write_spec, spec, filename))
+                           for index, spec, filename in unique_writes]
+                for index, future in futures:
+                    results[index] = future.result()
+
+        for index, source_index, filename in link_jobs:
+            filepath = self._output_path(filename)
+            try:
+                if filepath.exists():
+                    filepath.unlink()
+                os.link(results[source_index], filepath)
+                logger.info(f"Created: {filepath}")
+                results[index] = filepath
+            except OSError:
+                # Filesystem without hardlink support; write normally
+                results[index] = self.write_spec(specs[index][0], filename)
+
+        # Groups that lost a filename collision resolve to the winner's file
+        for index, (spec, filename) in enumerate(specs):
+            if results[index] is None:
+                results[index] = results[path_winners[filename]]
+
+        return results
+
     def split_by_tags(self) -> List[Path]:
         """
         Split the OpenAPI spec by tags.
@@ -364,16 +674,7 @@ class OpenAPISplitter:
             self.create_base_spec()
         
         groups = self.group_by_tags()
-        created_files = []
-        
-        for group_name, paths in groups.items():
-            spec = self.create_grouped_spec(group_name, paths)
-            safe_name = group_name.lower().replace(' ', '_').replace('/', '_')
-            filename = f"{safe_name}"
-            filepath = self.write_spec(spec, filename)
-            created_files.append(filepath)
-        
-        return created_files
+        return self._write_groups(groups)
     
     def split_by_paths(self, levels: int = 2) -> List[Path]:
         """
@@ -390,16 +691,7 @@ class OpenAPISplitter:
             self.create_base_spec()
         
         groups = self.group_by_path_prefix(levels)
-        created_files = []
-        
-        for group_name, paths in groups.items():
-            spec = self.create_grouped_spec(group_name, paths)
-            safe_name = group_name.lower().replace(' ', '_').replace('/', '_')
-            filename = f"{safe_name}"
-            filepath = self.write_spec(spec, filename)
-            created_files.append(filepath)
-        
-        return created_files
+        return self._write_groups(groups)
     
     def split(self, method: str = 'tags', path_levels: int = 2) -> List[Path]:
         """
@@ -417,7 +709,11 @@ class OpenAPISplitter:
         """
         self.load_spec()
         self.create_base_spec()
-        
+        # Specs without components take the fast path in
+        # create_grouped_spec and never need the closures.
+        if self.spec.get('components'):
+            self._build_component_closures()
+
         logger.info(f"Splitting {self.input_file} using method: {method}")
         
         if method == 'tags':
@@ -51,9 +51,13 @@ setup(
         "pyyaml>=6.0",
     ],
     extras_require={
+        "fast": [
+            "orjson>=3.8",
+        ],
         "dev": [
             "pytest>=7.0",
             "pytest-cov>=4.0",
+            "pytest-xdist>=3.0",
             "black>=22.0",
             "flake8>=5.0",
             "mypy>=0.990",
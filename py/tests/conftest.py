@@ -0,0 +1,95 @@
+"""Shared pytest fixtures for the test suite."""
+
+import json
+from types import MappingProxyType
+
+import pytest
+import yaml
+
+try:  # Prefer the libyaml C dumper when the bindings are installed
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
+
+def _build_sample_spec():
+    """Build the sample OpenAPI spec shared by the splitter tests."""
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Test API', 'version': '1.0.0'},
+        'paths': {
+            '/users': {
+                'get': {
+                    'tags': ['users'],
+                    'responses': {'200': {'description': 'Success'}}
+                }
+            },
+            '/products': {
+                'get': {
+                    'tags': ['products'],
+                    'responses': {'200': {'description': 'Success'}}
+                }
+            },
+            '/admin/settings': {
+                'get': {
+                    'tags': ['admin'],
+                    'responses': {'200': {'description': 'Success'}}
+                }
+            },
+            '/untagged': {
+                'get': {
+                    'responses': {'200': {'description': 'Success'}}
+                }
+            }
+        },
+        'components': {
+            'schemas': {
+                'User': {
+                    'type': 'object',
+                    'properties': {
+                        'id': {'type': 'integer'},
+                        'name': {'type': 'string'}
+                    }
+                }
+            }
+        }
+    }
+
+
+def _serialize_sample_yaml(spec):
+    """Serialize the sample spec to YAML bytes."""
+    return yaml.dump(dict(spec), Dumper=SafeDumper,
+                     sort_keys=False).encode('utf-8')
+
+
+def _serialize_sample_json(spec):
+    """Serialize the sample spec to JSON bytes."""
+    return json.dumps(dict(spec), separators=(',', ':')).encode('utf-8')
+
+
+@pytest.fixture(scope='session')
+def sample_spec():
+    """Read-only sample spec, built once per test session."""
+    return MappingProxyType(_build_sample_spec())
+
+
+@pytest.fixture(scope='session')
+def sample_yaml_bytes(sample_spec):
+    """The sample spec serialized to YAML once per session."""
+    return _serialize_sample_yaml(sample_spec)
+
+
+@pytest.fixture(scope='session')
+def sample_json_bytes(sample_spec):
+    """The sample spec serialized to JSON once per session."""
+    return _serialize_sample_json(sample_spec)
+
+
+@pytest.fixture(scope='class', autouse=True)
+def _attach_sample_spec(request, sample_yaml_bytes, sample_json_bytes):
+    """Expose the session fixtures to the splitter test classes."""
+    cls = request.cls
+    mixin = getattr(request.module, 'SplitterFixtureMixin', None)
+    if cls is not None and mixin is not None and issubclass(cls, mixin):
+        cls._yaml_bytes = sample_yaml_bytes
+        cls._json_bytes = sample_json_bytes